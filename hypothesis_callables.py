@@ -22,21 +22,37 @@ __all__ = [
 	"functions",
 	"methods",
 	"classmethods",
-	"staticmethods",
+	"staticfunctions",
+	"fusable",
+	"modules",
 	#"callables",
 	#"parameters"
 ]
 
 
 from collections import Iterable, OrderedDict
+from functools import wraps
 import sre_constants
+import weakref
+import keyword
+import string
+import inspect
+import ast
+import py_compile
+import importlib.util
+import tempfile
+import shutil
+import types
+import sys
+import os
 import re
 
 import hypothesis.strategies as hs
 from hypothesis.errors import InvalidArgument
-from hypothesis.searchstrategy import check_strategy
+from hypothesis.control import cleanup
+from hypothesis.searchstrategy import SearchStrategy, check_strategy
 from hypothesis.internal.coverage import check_function
-from hypothesis.searchstrategy.types import _global_strategy_lookup
+from hypothesis.searchstrategy.types import _global_type_lookup
 from hypothesis.internal.validation import (
 	check_type, check_valid_size, check_valid_interval, check_valid_integer
 )
@@ -93,6 +109,56 @@ variable bindings. It's also the default for generated function and class names.
 #_get_supported_binding_regex = lambda : sbr = _supported_binding_regex; \
 #	return sbr if hasattr(sbr, 'pattern') else re.compile(sbr)
 
+def _is_binding(binding):
+	"""Check a binding is supported and usable as a plain identifier."""
+	return bool(_supported_binding_regex.match(binding)) \
+		and not keyword.iskeyword(binding)
+
+def _bindings():
+	"""Strategy for generated bindings; keywords like 'if' match the regex."""
+	return hs.from_regex(_supported_binding_regex).filter(
+		lambda binding: not keyword.iskeyword(binding)
+	)
+
+_module_members = {}
+"""dict: Members of every module generated by modules(), keyed by module name.
+
+Members modules() can't write out as source are pulled out of here when the
+generated module is imported, so those only import in the generating process.
+"""
+
+_definitions = weakref.WeakKeyDictionary()
+"""WeakKeyDictionary: What plain classes() and functions() products were
+generated from, so modules() can write them out as source again.
+"""
+
+def _literal_source(value):
+	"""Source for value if its repr() is a literal evaluating back to it."""
+	try:
+		source = repr(value)
+		rebuilt = ast.literal_eval(source)
+	except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+		return None
+
+	if type(rebuilt) is not type(value) or rebuilt != value:
+		return None
+
+	return source
+
+def _is_free_module_name(name):
+	"""Check nothing importable already goes by name.
+
+	Builtin and frozen modules are found before anything on sys.path, so a
+	generated module must never share a name with them, imported or not.
+	"""
+	# leaves room for the __pycache__ suffix within common filename limits
+	if len(name) > 128:
+		return False
+	if name in sys.modules or name in sys.builtin_module_names:
+		return False
+
+	return importlib.util.find_spec(name) is None
+
 def _phony_callable(*args, **kwargs):
 	"""DOCUMENT ME!!!"""
 	return (args, kwargs)
@@ -105,15 +171,56 @@ def _check_callable(arg, name=''):
 		raise InvalidArgument('Expected a callable object but got %s%r \
 								(type=%s)' % (name, arg, type(arg).__name__))
 
+def fusable(before=None, after=None):
+	"""Build a decorator that functions() can fuse into generated bodies.
+
+	The fusion protocol is a ``__fuse__`` attribute holding a
+	``(before, after)`` pair. ``before(args, kwargs)`` must return a new
+	``(args, kwargs)`` pair and ``after(result)`` a new result; either may
+	be None. Applied normally the decorator wraps like any other, but with
+	``fuse_decorators=True`` the hooks are called inline from the generated
+	function, so a stack of N fusable decorators costs one frame, not N.
+	Hooks see exactly what they would see applied normally: ``before`` gets
+	the caller's arguments as passed, and its output is checked against the
+	generated signature before ``body`` is called. Only the innermost run
+	of fusable decorators is fused; everything above it still wraps.
+	"""
+	if before is not None: _check_callable(before, name="before")
+	if after is not None: _check_callable(after, name="after")
+
+	def decorator(function):
+		@wraps(function)
+		def wrapper(*args, **kwargs):
+			if before is not None:
+				args, kwargs = before(args, kwargs)
+			result = function(*args, **kwargs)
+			return result if after is None else after(result)
+		return wrapper
+
+	decorator.__fuse__ = (before, after)
+	return decorator
+
+def _split_fusable(decorators):
+	"""Split decorators into (applied, fused) at the innermost fusable run.
+
+	Only a trailing run can be fused; anything outside a regular decorator
+	has to stay a real wrapper since it may depend on the wrapped object.
+	"""
+	split = len(decorators)
+	while split > 0 and hasattr(decorators[split - 1], "__fuse__"):
+		split -= 1
+
+	return (decorators[:split], decorators[split:])
+
 def _validate_bindings(draw, elements, name=""):
 	"""DOCUMENT ME!!!"""
 
-	# Use OrderedDict over regular to enforce strictness of binding position
-	# because they tranlate directly to a linear memory map.
-	check_type(OrderedDict, elements, name)
+	# Insertion order enforces strictness of binding position because they
+	# tranlate directly to a linear memory map. OrderedDict is still a dict.
+	check_type(dict, elements, name)
 
 	# preallocated memory pool for optimized access times.
-	def static(): return tuple(None for elm in elements)
+	def static(): return [None for elm in elements]
 
 	bindings = static()
 	values = static()
@@ -130,12 +237,16 @@ def _validate_bindings(draw, elements, name=""):
 		elif isinstance(key, text_type):
 			if not _supported_binding_regex.match(key):
 				try:
-					key = draw(hs.from_regex(key))
+					# from_regex only promises a match somewhere in the string,
+					# so anchor it; what's left to filter is the regex's doing
+					key = draw(hs.from_regex(
+						u"^(?:%s)\\Z" % (key)
+					).filter(_is_binding))
 				except(sre_constants.error):
 					raise InvalidArgument(
 						"Could not satisfy requirements of binding \
 						'%s' at index '%i' in %s, invalid regex."
-						% (key, index, name)
+						% (key, pos, name)
 					)
 
 			bindings[pos] = key
@@ -149,25 +260,48 @@ def _validate_bindings(draw, elements, name=""):
 		# Generate our children after sorting; micro optimization
 		values[pos] = draw(value)
 
-	unknown_bindings = len(lost_members)
+	unknown_bindings = len(unknown)
 	generated_bindings = draw(hs.lists(
-		hs.from_regex(_supported_binding_regex),
+		_bindings().filter(lambda b: b not in bindings),
 		min_size=unknown_bindings,
 		max_size=unknown_bindings,
 		unique=True,
 	))
 
-	for long, lat in enumerate(unknown_bindings):
+	for long, lat in enumerate(unknown):
 		bindings[lat] = generated_bindings[long]
 
 	return (bindings, values)
 
 @hs.composite
-def _strategies(min_difficulty=None, max_difficulty=None):
+def _strategies(draw, min_difficulty=None, max_difficulty=None):
 	"""DOCUMENT ME!!!"""
-	return draw(one_of(
-		_global_strategy_lookup.items()[min_difficulty : max_difficulty]
-	))
+	# some entries are resolver functions for generic types, not strategies
+	return draw(hs.one_of([
+		strategy for strategy in _global_type_lookup.values()
+			if isinstance(strategy, SearchStrategy)
+	][min_difficulty : max_difficulty]))
+
+def _class_source(class_name, bases, bindings, values):
+	"""Source for a generated class.
+
+	``bases`` and ``values`` are source expressions, so the same definition
+	can be exec'd against a namespace or written out as a standalone module.
+	Keywords match the binding regex but can't be assigned in a class body,
+	so those children get set through ``__setattr`` right after it.
+	"""
+	children = list(zip(bindings, values))
+	body = [
+		"\t%s = %s\n" % (binding, value) for binding, value in children
+			if not keyword.iskeyword(binding)
+	]
+
+	return "".join([
+		"class ", class_name, "(", bases, "):\n",
+	] + (body or ["\tpass\n"]) + [
+		"__setattr(%s, %r, %s)\n" % (class_name, str(binding), value)
+			for binding, value in children if keyword.iskeyword(binding)
+	])
 
 # TODO:
 #	*Possibly add automatic generation of children on unassigned children*
@@ -177,40 +311,69 @@ def _strategies(min_difficulty=None, max_difficulty=None):
 def classes(draw, name=None, inherits=None, children=None):
 	"""DOCUMENT ME!!!"""
 	# double check types because insurance :P (and hypothesis standards lol)
-	check_type(text_type, name, "name")
-	check_type(list, inherits, "inherits")
+	if name is not None:
+		check_type(text_type, name, "name")
+	if inherits is not None:
+		check_type(list, inherits, "inherits")
+	else:
+		inherits = []
 
 	if children is None:
+		# generated children shouldn't hide anything the ancestors provide
 		children = draw(hs.dictionaries(
-			hs.from_regex(_supported_binding_regex),
+			_bindings().filter(
+				lambda b: not any(hasattr(base, b) for base in inherits)
+			),
 			_strategies()
 		))
 
-		bindings = children.keys()
-		values = children.values()
+		bindings = list(children.keys())
+		values = list(children.values())
 	else:
 		bindings, values = _validate_bindings(draw, children, name="children")
 
-	class_name = draw(hs.from_regex(
-		name if name is not None else _supported_binding_regex
-	))
- 	code = "".join([
-		"class ", class_name, "(*inherits):\n\t", "\n\t".join(
-			["pass"] if len(members) < 1 else [
-				"%s = tallent[%r]" % (name, pos) \
-					for pos, name in enumerate(members)
-			]
-		)
+	class_name = draw(
+		_bindings() if name is None else hs.from_regex(name).filter(_is_binding)
+	)
+
+	# NOTE:
+	#	Dunder names aren't mangled in class bodies and can't be generated
+	#	bindings, so children and ancestors can't shadow them.
+	namespace = {
+		"__inherits__": inherits,
+		"__children__": values,
+		"__setattr": setattr,
+	}
+	exec(_class_source(
+		class_name, "*__inherits__", bindings,
+		["__children__[%d]" % (pos) for pos in range(len(values))]
+	), namespace)
+
+	product = namespace[class_name]
+	_definitions[product] = (namespace["__inherits__"], bindings, values)
+
+	return product
+
+def _function_source(function_name, argb, kwargb, defaults, body):
+	"""Source for a generated function handing its arguments to body.
+
+	``defaults`` and ``body`` are source expressions, same as for
+	_class_source().
+	"""
+	return "".join([
+		'def ', function_name, '(',
+			"".join(arg + "," for arg in argb),
+			"".join("%s=%s," % pair for pair in zip(kwargb, defaults)),
+		'): return ', body, '(',
+			"".join(arg + "," for arg in argb),
+			"".join("%s=%s," % (kwarg, kwarg) for kwarg in kwargb),
+		')\n',
 	])
 
-	exec(code, locals())
-
-	return locals()[class_name]
-
 # I really never thought I'd be testing variable function inputs at any point in my life...
 @hs.composite
 def functions(draw,
-		name=None
+		name=None,
 		min_argc=None, # int
 		max_argc=None, # int
 		manual_argument_bindings=None, # {} dict
@@ -218,6 +381,7 @@ def functions(draw,
 		body=_phony_callable,
 		decorators=None, # [] list
 		kwarginit=hs.nothing(),
+		fuse_decorators=False,
 	):
 	"""DOCUMENT ME!!!"""
 
@@ -237,94 +401,186 @@ def functions(draw,
 			_check_callable(d, name="iteration %r in 'decorators'" % (index))
 
 	_check_callable(body, name="body")
+	check_type(bool, fuse_decorators, "fuse_decorators")
+
+	if fuse_decorators and decorators is not None:
+		# a third party __fuse__ would otherwise only fail once called
+		for d in _split_fusable(decorators)[1]:
+			hooks = d.__fuse__
+			if not isinstance(hooks, tuple) or len(hooks) != 2:
+				raise InvalidArgument(
+					"Expected __fuse__ of %r to be a (before, after) pair \
+					but got %r" % (d, hooks)
+				)
 
-	#if not hasattr(binding_regex, 'pattern'):
-	#	# this has to be done later anyway inside the binding generator,
-	#	# might as well do it now to make things a little faster.
-	#	binding_regex = re.compile(binding_regex)
+			for hook in hooks:
+				if hook is not None:
+					_check_callable(hook, name="hook in __fuse__ of %r" % (d))
+
+	spec = getfullargspec(body)
+	if (spec.varargs is None and spec.varkw is None):
+		#(min_argc is not None and min_argc < len(spc.args)) or \
+		#(max_argc is not None and max_argc > len(spc.args)) or \
+		# NOTE:
+		#	can't validate signature for kwargs so we're gonna require the
+		#	wrapper function contain both varargs and varkw just to be safe.
+		raise InvalidArgument(
+			"function body %s cannot support generated argument range" % (body)
+		)
+
+	manual_bindings = []
+	for bindings, bindings_name in (
+			(manual_argument_bindings, "manual_argument_bindings"),
+			(manual_keyword_bindings, "manual_keyword_bindings"),
+		):
+		if bindings is None:
+			continue
+
+		check_type(dict, bindings, bindings_name)
+		for key, value in bindings.items():
+			check_type(int, key, name="key in %s" % (bindings_name))
+			check_type(text_type, value, name="value in %s" % (bindings_name))
+
+			if not _is_binding(value):
+				raise InvalidArgument(
+					"binding dictionary value at '%s' in %s does not match \
+					binding regex. '%s' not found in (regex=%s)"
+					% (key, bindings_name, value,
+						_supported_binding_regex.pattern)
+				)
+
+			manual_bindings.append(value)
+
+	# generated bindings must not clash with the manual ones swapped in below
+	bindings = _bindings().filter(lambda b: b not in manual_bindings)
 
 	argb = draw(hs.lists(
-		hs.from_regex(binding_regex),
+		bindings,
 		min_size=min_argc,
 		max_size=max_argc,
 		unique=True,
 	))
-	argc = len(argb)
 
 	if kwarginit is not hs.nothing():
 		# generate keyword inital values and bindings
-		kwargv = draw(kwarginit)
+		kwargv = list(draw(kwarginit))
 		kwargc = len(kwargv)
 		kwargb = draw(hs.lists(
-			hs.from_regex(binding_regex),
+			bindings.filter(lambda b: b not in argb),
 			min_size=kwargc,
 			max_size=kwargc,
 			unique=True,
-			unique_by=lambda x: x not in argb.keys()
 		))
 	else:
-		kwargc = 0
 		kwargb = []
 		kwargv = []
 
-	spec = getfullargspec(body)
-	if (spec.varargs is None and spec.varkw is None):
-		#(min_argc is not None and min_argc < len(spc.args)) or \
-		#(max_argc is not None and max_argc > len(spc.args)) or \
-		# NOTE:
-		#	can't validate signature for kwargs so we're gonna require the
-		#	wrapper function contain both varargs and varkw just to be safe.
-		raise InvalidArgument(
-			"function body %s cannot support generated argument range" % (body)
-		)
-
 	if manual_argument_bindings is not None:
 		for key, value in manual_argument_bindings.items():
-			check_type(int, key, name="")
-			check_type(text_type, value, name="")
-
-			if not binding_regex.match(binding):
-				raise InvalidArgument(
-					"binding dictionary value at '%s' does not match binding \
-					regex. '%s' not found in (regex=%s)"
-					% (key, value, binding_regex)
-				)
-
-			if key <= argb: argb[key] = value
+			if key < len(argb): argb[key] = value
 
 	if manual_keyword_bindings is not None:
 		for key, value in manual_keyword_bindings.items():
-			check_type(int, key, name="")
-			check_type(text_type, value, name="")
+			if key < len(kwargb): kwargb[key] = value
+
+	function_name = draw(
+		_bindings() if name is None else hs.from_regex(name).filter(_is_binding)
+	)
+	arg_defs = "".join(arg + "," for arg in argb)
+	kwarg_defs = "".join(
+		"%s=__kwargv[%d]," % (kwarg, index)
+			for index, kwarg in enumerate(kwargb)
+	)
+	kwarg_pass = "".join("%s=%s," % (kwarg, kwarg) for kwarg in kwargb)
+
+	fused = []
+	if fuse_decorators and decorators is not None:
+		decorators, fused = _split_fusable(decorators)
+
+	# NOTE:
+	#	Generated bindings can't start with two underscores (see the BUG
+	#	note on _supported_binding_regex), so the names the generated code
+	#	reads from its namespace never collide with the function or its
+	#	arguments. Using a fresh namespace over locals() keeps them from
+	#	colliding with our own locals too.
+	namespace = {"__body": body, "__kwargv": kwargv}
+
+	if fused:
+		namespace["__before"] = [d.__fuse__[0] for d in fused]
+		namespace["__after"] = [d.__fuse__[1] for d in reversed(fused)]
+
+		before = [
+			'\t__args, __kwargs = __before[%d](__args, __kwargs)\n' % (index)
+				for index, hook in enumerate(namespace["__before"])
+				if hook is not None
+		]
+		after = [
+			'\t__result = __after[%d](__result)\n' % (index)
+				for index, hook in enumerate(namespace["__after"])
+				if hook is not None
+		]
+
+		if before:
+			# Applied normally, whatever the before hooks return goes back
+			# through the generated signature; __bind does that check in
+			# the same frame and hands back what the signature passes on.
+			code = "".join([
+				'def __bind(', arg_defs, kwarg_defs, '):\n',
+				'\treturn (', arg_defs, '), {',
+					"".join("%r:%s," % (kwarg, kwarg) for kwarg in kwargb),
+				'}\n',
+				'def ', function_name, '(*__args, **__kwargs):\n',
+			] + before + [
+				'\t__args, __kwargs = __bind(*__args, **__kwargs)\n',
+				'\t__result = __body(*__args, **__kwargs)\n',
+			] + after + [
+				'\treturn __result\n',
+			])
+		else:
+			code = "".join([
+				'def ', function_name, '(', arg_defs, kwarg_defs, '):\n',
+				'\t__result = __body(', arg_defs, kwarg_pass, ')\n',
+			] + after + [
+				'\treturn __result\n',
+			])
+	else:
+		code = _function_source(
+			function_name, argb, kwargb,
+			["__kwargv[%d]" % (index) for index in range(len(kwargb))],
+			"__body"
+		)
 
-			if not binding_regex.match(binding):
-				raise InvalidArgument(
-					"binding dictionary value at %s does not match binding \
-					regex. '%s' not found in (regex=%s)"
-					%(key, value, binding_regex)
-				)
+	exec(code, namespace)
 
-			if key <= kwargb: kwargb[key] = value
+	function = namespace[function_name]
 
-	function_name = draw(hs.from_regex(binding_regex))
-	arg_defs = ",".join(argb),
-	kwarg_defs = ("".join([kwarg, "=kwargv[", str(index), "],"])) \
-		for index, kwarg in enumerate(kwargb)
-	kwarg_pass = ("".join(kwarg, "=", kwarg, ",") for kwarg in kwargb),
+	# Taking *args/**kwargs for the before hooks hides the signature we
+	# generated; __bind still has it, so report that one instead.
+	if "__bind" in namespace:
+		function.__signature__ = inspect.signature(namespace["__bind"])
 
-	code = "".join([
-		'def ', function_name, '(', arg_defs, *list(kwarg_defs), '): ',
-			'return body(', arg_defs, *list(kwarg_pass), ')'
-	])
+	if not (fused or decorators):
+		_definitions[function] = (argb, kwargb, kwargv, body)
 
-	exec(code, locals())
+	if decorators:
+		for d in reversed(decorators): function = d(function)
 
-	function = locals()[function_name]
+	return function
 
-	if decorators is not None:
-		for d in reverse(decorators): function = d(function)
+def _method_trampoline(container, method):
+	"""Attach method to container and return a callable forwarding to it.
 
-	return function
+	The attribute is looked up on every call, same as calling it through the
+	container by hand, so the trampoline picks up anything rebinding it.
+	"""
+	# classmethod and staticmethod objects only carry a name on __func__
+	binding = getattr(method, "__func__", method).__name__
+	setattr(container, binding, method)
+
+	def trampoline(*args, **kwargs):
+		return getattr(container, binding)(*args, **kwargs)
+
+	return trampoline
 
 @hs.composite
 def methods(draw,
@@ -335,35 +591,33 @@ def methods(draw,
 		body=_phony_callable,
 		decorators=None, # [] itterable
 		kwarginit=hs.nothing(),
-		parent=classes()
+		parent=classes(),
+		fuse_decorators=False,
 	):
 	"""DOCUMENT ME!!!"""
 	check_strategy(parent, name="parent")
-	check_type(dict, manual_argument_bindings, name="manual_argument_bindings")
+	check_valid_integer(min_argc)
+	check_valid_integer(max_argc)
 
-	min_argc = 0 if min_argc is None \
-		else check_valid_integer(min_argc, name="min_argc")
-	max_argc = 0 if max_argc is None \
-		else check_valid_integer(max_argc, name="max_argc")
+	min_argc = 0 if min_argc is None else min_argc
+	max_argc = 0 if max_argc is None else max_argc
 
 	arguments = {0: "self"}
-	arguments.update(manual_argument_bindings)
+	if manual_argument_bindings is not None:
+		check_type(dict, manual_argument_bindings,
+			name="manual_argument_bindings")
+		arguments.update(manual_argument_bindings)
 
 	container = draw(parent)
 	method_body = draw(functions(
-		binding_regex=binding_regex,
 		min_argc=(min_argc + 1), max_argc=(max_argc+1),
 		manual_argument_bindings = arguments,
 		manual_keyword_bindings = manual_keyword_bindings, body=body,
-		decorators = decorators, kwarginit = kwarginit
+		decorators = decorators, kwarginit = kwarginit,
+		fuse_decorators = fuse_decorators
 	))
-	setattr(container, method_body.__name__, method_body)
 
-	call = "".join(["container.", method_body.__name__, "(*args, **kwargs)"])
-	def method_wrapper(*args, **kwargs):
-		exec(call , locals())
-
-	return method_wrapper
+	return _method_trampoline(container, method_body)
 
 @hs.composite
 def classmethods(draw,
@@ -375,26 +629,30 @@ def classmethods(draw,
 		kwarginit=hs.nothing(),
 		decorators=None, # [] itterable
 		body=_phony_callable,
+		fuse_decorators=False,
 	):
 	"""DOCUMENT ME!!!"""
 	check_strategy(parent, name="parent")
-	check_type(dict, manual_argument_bindings, name="manual_argument_bindings")
-	check_type(list, decorators, name="decorators")
+	check_valid_integer(min_argc)
+	check_valid_integer(max_argc)
 
-	min_argc = 0 if min_argc is None \
-		else check_valid_integer(min_argc, name="min_argc")
-	max_argc = 0 if max_argc is None \
-		else check_valid_integer(max_argc, name="max_argc")
+	min_argc = 0 if min_argc is None else min_argc
+	max_argc = 0 if max_argc is None else max_argc
 
 	arguments = {0: "cls"} # designation of defaults must be preemptive
-	arguments.update(manual_argument_bindings) # because this is override
+	if manual_argument_bindings is not None:
+		check_type(dict, manual_argument_bindings,
+			name="manual_argument_bindings")
+		arguments.update(manual_argument_bindings) # because this is override
+
+	if decorators is not None:
+		check_type(list, decorators, name="decorators")
 
 	# classmethod designation must be first in the series function properly
-	decorators = [classmethod,] + decorators
+	decorators = [classmethod,] + (decorators or [])
 
 	container = draw(parent)
 	method_body = draw(functions(
-		binding_regex=binding_regex,
 		min_argc=(min_argc+1),
 		max_argc=(max_argc+1),
 		manual_argument_bindings=arguments, # enforce defaults
@@ -402,14 +660,10 @@ def classmethods(draw,
 		kwarginit=kwarginit,
 		decorators=decorators,
 		body=body,
+		fuse_decorators=fuse_decorators,
 	))
-	setattr(container, method_body.__name__, method_body)
-
-	call = "".join(["container.", method_body.__name__, "(*args, **kwargs)"])
-	def method_wrapper(*args, **kwargs):
-		exec(call , locals())
 
-	return method_wrapper
+	return _method_trampoline(container, method_body)
 
 @hs.composite
 def staticfunctions(draw,
@@ -421,32 +675,258 @@ def staticfunctions(draw,
 		kwarginit=hs.nothing(),
 		decorators=None, # [] itterable
 		body=_phony_callable,
+		fuse_decorators=False,
 	):
 	"""DOCUMENT ME!!!"""
 	check_strategy(parent, name="parent")
-	check_type(list, decorators, name="decorators")
+
+	if decorators is not None:
+		check_type(list, decorators, name="decorators")
 
 	# primary decorator must be first in the series function properly
-	decorators = [staticmethod,] + decorators
+	decorators = [staticmethod,] + (decorators or [])
 
 	container = draw(parent)
 	method_body = draw(functions(
-		binding_regex=binding_regex,
 		min_argc=min_argc,
 		max_argc=max_argc,
-		manual_argument_bindings=arguments,
+		manual_argument_bindings=manual_argument_bindings,
 		manual_keyword_bindings=manual_keyword_bindings,
 		kwarginit=kwarginit,
 		decorators=decorators,
 		body=body,
+		fuse_decorators=fuse_decorators,
 	))
-	setattr(container, method_body.__name__, method_body)
 
-	call = "".join(["container.", method_body.__name__, "(*args, **kwargs)"])
-	def function_wrapper(*args, **kwargs):
-		exec(call , locals())
+	return _method_trampoline(container, method_body)
+
+def _checked_member(member):
+	"""Make sure member can be bound in a module under its own __name__."""
+	binding = getattr(member, "__name__", None)
+
+	# NOTE:
+	#	Bindings starting with two underscores are kept for the helpers the
+	#	generated source defines, and may not be used by members.
+	if not isinstance(binding, text_type) or not binding.isidentifier() \
+			or keyword.iskeyword(binding) or binding.startswith("__"):
+		raise InvalidArgument(
+			"Expected members with an identifier for a __name__, but got \
+			%r (__name__=%r)" % (member, binding)
+		)
 
-	return function_wrapper
+	return member
+
+def _member_source(member, names):
+	"""Standalone source redefining member, or None if it has to be bound.
+
+	Only plain classes() and functions() products have a definition to go
+	by, and only while everything it refers to can be written out as well:
+	children and keyword defaults must survive repr(), ancestors must be
+	earlier members (``names`` maps their ids to their bindings) and the
+	body must be the default one.
+	"""
+	try:
+		definition = _definitions.get(member)
+	except TypeError: # unhashable, so it isn't one of ours either
+		return None
+
+	if definition is None:
+		return None
+
+	if isinstance(member, type):
+		bases, bindings, values = definition
+		bases = [names.get(id(base)) for base in bases]
+		values = [_literal_source(value) for value in values]
+		if None in bases or None in values:
+			return None
+
+		return _class_source(
+			member.__name__, ", ".join(bases), bindings, values
+		)
+
+	argb, kwargb, kwargv, body = definition
+	defaults = [_literal_source(value) for value in kwargv]
+	if body is not _phony_callable or None in defaults:
+		return None
+
+	return _function_source(member.__name__, argb, kwargb, defaults, "__phony")
+
+def _bulk_member_sources(draw, count):
+	"""Draw sources for count classes and functions in bulk.
+
+	A full classes() or functions() draw per member runs out of data long
+	before a module holds hundreds of them. Here names come from one short
+	stem plus the member's index and argument names from their position, so
+	each member only draws its kind, its size and a byte per literal.
+	"""
+	stem = draw(hs.text(alphabet=string.ascii_letters, min_size=1, max_size=8))
+	literal = hs.integers(min_value=0, max_value=255)
+
+	definitions = []
+	for index in range(count):
+		member_name = "%s_%d" % (stem, index)
+		size = draw(hs.integers(min_value=0, max_value=3))
+
+		if draw(hs.booleans()):
+			definitions.append(_class_source(
+				member_name, "",
+				["c_%d" % (pos) for pos in range(size)],
+				[repr(draw(literal)) for pos in range(size)]
+			))
+		else:
+			kwargc = draw(hs.integers(min_value=0, max_value=2))
+			definitions.append(_function_source(
+				member_name,
+				["a_%d" % (pos) for pos in range(size)],
+				["k_%d" % (pos) for pos in range(kwargc)],
+				[repr(draw(literal)) for pos in range(kwargc)],
+				"__phony"
+			))
+
+	return definitions
+
+@hs.composite
+def modules(draw,
+		name=None,
+		min_members=None, # int
+		max_members=None, # int
+		members=None, # strategy
+		on_disk=False,
+	):
+	"""Generate a module holding a bulk of classes and functions.
+
+	The module is compiled from a single code object and installed in
+	sys.modules until the current example finishes. With ``on_disk=True``
+	its source and bytecode are written to a temporary directory and it is
+	loaded through the real import machinery instead, so import costs can
+	be measured against module size; ``__file__`` points at the ``.py``.
+
+	By default members are generated in bulk, as the same class and def
+	statements classes() and functions() build, between ``min_members`` and
+	``max_members`` (``min_members + 100`` if unset) of them. That keeps
+	hundreds of members within reach, and the module imports anywhere.
+
+	A ``members`` strategy draws each member in full instead, which costs
+	far more data per member. Members are bound under their ``__name__``,
+	which has to be a plain identifier. Plain classes() and functions()
+	products are written out as source again. That doesn't work for
+	decorated functions, bodies other than the default, children or
+	defaults whose repr() isn't a literal, or ancestors from outside the
+	module. Such members, and anything not from classes() or functions(),
+	are bound from the generating process instead. A module holding any of
+	them won't import anywhere else.
+	"""
+	check_valid_size(min_members, "min_members")
+	check_valid_size(max_members, "max_members")
+	check_valid_interval(min_members, max_members, "min_members", "max_members")
+	check_type(bool, on_disk, "on_disk")
+
+	min_members = None if min_members is None else ceil(min_members)
+	max_members = None if max_members is None else floor(max_members)
+
+	module_name = draw((
+		_bindings() if name is None else hs.from_regex(name).filter(_is_binding)
+	).filter(_is_free_module_name))
+
+	names = {}
+	definitions = []
+	bound = False
+
+	if members is None:
+		min_members = 0 if min_members is None else min_members
+		max_members = min_members + 100 if max_members is None else max_members
+
+		definitions = _bulk_member_sources(draw, draw(hs.integers(
+			min_value=min_members, max_value=max_members
+		)))
+		members = []
+	else:
+		check_strategy(members, name="members")
+
+		members = draw(hs.lists(
+			members.map(_checked_member),
+			min_size=min_members,
+			max_size=max_members,
+			unique_by=lambda member: member.__name__,
+		))
+
+	for index, member in enumerate(members):
+		definition = _member_source(member, names)
+		if definition is None:
+			definition = "%s = __members[%d]\n" % (member.__name__, index)
+			bound = True
+
+			# loaders tend to pick out members by where they claim to be from
+			try:
+				member.__module__ = module_name
+			except (AttributeError, TypeError):
+				pass
+
+		definitions.append(definition)
+		names[id(member)] = member.__name__
+
+	# NOTE:
+	#	Module level bindings starting with two underscores can't collide
+	#	with member names, same as in functions().
+	source = "".join([
+		"__setattr = setattr\n",
+		"def __phony(*args, **kwargs):\n",
+		"\treturn (args, kwargs)\n",
+	] + ([
+		"from hypothesis_callables import _module_members as __members\n",
+		"__members = __members[__name__]\n",
+	] if bound else []) + definitions + ([
+		"del __members\n",
+	] if bound else []))
+
+	directory = tempfile.mkdtemp(prefix="hypothesis_callables_") \
+		if on_disk else None
+
+	module = types.ModuleType(module_name)
+
+	def teardown():
+		# Timing an import means re-importing by name, which leaves a fresh
+		# module in sys.modules; anything loaded from our directory is ours.
+		installed = sys.modules.get(module_name)
+		if installed is module or directory is not None and (
+				getattr(installed, "__name__", None) == module_name and
+				os.path.dirname(getattr(installed, "__file__", None) or "") \
+					== directory
+			):
+			del sys.modules[module_name]
+
+		_module_members.pop(module_name, None)
+		if directory is not None:
+			if directory in sys.path: sys.path.remove(directory)
+			sys.path_importer_cache.pop(directory, None)
+			shutil.rmtree(directory, ignore_errors=True)
+
+	# register before installing anything so a failed import still cleans up
+	cleanup(teardown)
+	_module_members[module_name] = members
+
+	if directory is None:
+		code = compile(source, "<%s>" % (module_name), "exec")
+		sys.modules[module_name] = module
+		exec(code, module.__dict__)
+	else:
+		path = os.path.join(directory, module_name + ".py")
+		with open(path, "w") as stream:
+			stream.write(source)
+
+		# writes the .pyc wherever the import system will look for it
+		py_compile.compile(path, doraise=True)
+
+		# Loading from the spec rather than by name means no finder ahead of
+		# ours gets a say; the loader still picks up the .pyc written above.
+		# The directory goes on sys.path so re-importing by name works too.
+		spec = importlib.util.spec_from_file_location(module_name, path)
+		module = importlib.util.module_from_spec(spec)
+		sys.path.insert(0, directory)
+		sys.modules[module_name] = module
+		spec.loader.exec_module(module)
+
+	return module
 
 #@hs.composite
 #def callables(draw,
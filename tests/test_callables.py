@@ -27,11 +27,17 @@ from hypothesis.strategies import *
 from hypothesis_callables import *
 
 from hypothesis_callables import _supported_binding_regex
+from hypothesis_callables import _is_free_module_name
 
 import pytest # test library
 import pdb # debugger
 
 import re
+import inspect
+import marshal
+import importlib
+import importlib.util
+import subprocess
 
 _unsupported_binding_regex = re.compile(r"^(?!%s).*\Z" \
 	% (_supported_binding_regex.pattern[1:-2]))
@@ -131,14 +137,29 @@ class TestClassStrategy(object):
 
 		product = data.draw(classes(inherits=unique_ancestors))
 
+		# the MRO favours earlier ancestors, so those have to win the merge
 		product_elements = {}
-		for mapping in unique_children: product_elements.update(mapping)
+		for mapping in reversed(unique_children):
+			product_elements.update(mapping)
 
 		assert all(
 			getattr(product, key) is value \
 				for key, value in product_elements.items()
 		)
 
+	@given(classes(children={"[a-z]+": just(1)}))
+	def test_regex_child_binding(self, product):
+		assert [
+			binding for binding, value in vars(product).items()
+				if value == 1 and re.search("[a-z]+", binding)
+		]
+
+	def test_ancestors_keep_base_order(self):
+		ancestor = classes(children={}).example()
+		product = classes(inherits=[ancestor, object]).example()
+
+		assert product.__mro__[1:] == (ancestor, object)
+
 	@given(data())
 	def test_bad_child_keys(self, data):
 		"""DOCUMENT ME!!!"""
@@ -149,8 +170,9 @@ class TestClassStrategy(object):
 			bad_children = data.draw(primitives_w_bindings( \
 				False, False, True, min_size=1 ))
 
+			good_children.update(bad_children)
 			product = data.draw(classes( \
-				children = good_children.update(bad_children) ))
+				children = good_children ))
 
 	#def test_bad_ancestor(self, data):
 	#	NOTE: Can't really have a bad ancestor because of how inheritance works
@@ -159,11 +181,269 @@ class TestClassStrategy(object):
 	#	NOTE: Can't have bad binding regex
 
 	@given(data())
-	def test_good_instance(self):
+	def test_good_instance(self, data):
 		pass
 
+def _stack_depth():
+	"""Count the frames above the caller."""
+	frame, depth = sys._getframe(1), 0
+	while frame is not None:
+		frame, depth = frame.f_back, depth + 1
+	return depth
+
+def _depth_body(*args, **kwargs):
+	return (_stack_depth(),)
+
+def _tagging_decorator(tag):
+	"""Fusable decorator appending its tag to the result."""
+	return fusable(after=lambda result: result + (tag,))
+
+def _appending_decorator(value):
+	"""Fusable decorator appending value to the positional arguments."""
+	return fusable(before=lambda args, kwargs: (args + (value,), kwargs))
+
+def _plain_tagging_decorator(tag):
+	"""Same as _tagging_decorator, without declaring itself fusable."""
+	def decorator(function):
+		def wrapper(*args, **kwargs):
+			return function(*args, **kwargs) + (tag,)
+		return wrapper
+	return decorator
+
 class TestCallableStrategies(object):
-	pass
+	"""Tests for functions(), the method strategies and decorator fusion."""
+
+	def test_fusable_wraps_when_applied(self):
+		decorator = _tagging_decorator(1)
+		wrapped = decorator(lambda *args, **kwargs: (args,))
+
+		assert decorator.__fuse__[0] is None
+		assert wrapped(0) == ((0,), 1)
+
+	def test_bad_fusable_hooks(self):
+		with pytest.raises(he.InvalidArgument):
+			fusable(before=1)
+
+	@given(data())
+	def test_fused_decorators_keep_order(self, data):
+		tags = data.draw(lists(integers(), min_size=1, max_size=10))
+		decorators = [_tagging_decorator(tag) for tag in tags]
+		body = lambda *args, **kwargs: ()
+
+		applied = data.draw(functions(
+			max_argc=0, body=body, decorators=decorators
+		))
+		fused = data.draw(functions(
+			max_argc=0, body=body, decorators=decorators, fuse_decorators=True
+		))
+
+		assert applied() == fused() == tuple(reversed(tags))
+
+	@given(data())
+	def test_fused_decorators_cost_one_frame(self, data):
+		decorators = [_tagging_decorator(tag) for tag in range(10)]
+
+		bare = data.draw(functions(max_argc=0, body=_depth_body))
+		fused = data.draw(functions(
+			max_argc=0, body=_depth_body, decorators=decorators,
+			fuse_decorators=True
+		))
+
+		assert bare()[0] == fused()[0]
+
+	@given(data())
+	def test_fused_before_rebinds_arguments(self, data):
+		decorators = [_appending_decorator(5)]
+		generated = lambda **kwargs: functions(
+			min_argc=1, max_argc=1, kwarginit=just([9]),
+			decorators=decorators, **kwargs
+		)
+
+		applied = data.draw(generated())
+		fused = data.draw(generated(fuse_decorators=True))
+
+		# the appended value lands on the keyword through the signature
+		for function in (applied, fused):
+			args, kwargs = function(1)
+			assert args == (1,)
+			assert list(kwargs.values()) == [5]
+
+			with pytest.raises(TypeError):
+				function(1, 2)
+
+	@given(data())
+	def test_fused_keeps_signature(self, data):
+		generated = lambda **kwargs: data.draw(functions(
+			min_argc=2, max_argc=2, kwarginit=just([9]),
+			decorators=[_appending_decorator(5)], **kwargs
+		))
+
+		applied = inspect.signature(generated())
+		fused = inspect.signature(generated(fuse_decorators=True))
+
+		# bindings are drawn per function, so compare everything but names
+		shape = lambda signature: [
+			(parameter.kind, parameter.default)
+				for parameter in signature.parameters.values()
+		]
+		assert shape(fused) == shape(applied)
+		assert len(fused.parameters) == 3
+
+	def test_bad_fuse_protocol(self):
+		for hooks in ((1, None), (None,), "ab"):
+			decorator = lambda function: function
+			decorator.__fuse__ = hooks
+
+			with pytest.raises(he.InvalidArgument):
+				functions(
+					decorators=[decorator], fuse_decorators=True
+				).example()
+
+	@given(data())
+	def test_fused_mixed_decorator_stack(self, data):
+		decorators = [
+			_plain_tagging_decorator(0),
+			_tagging_decorator(1),
+			_plain_tagging_decorator(2),
+			_tagging_decorator(3),
+			_tagging_decorator(4),
+		]
+		body = lambda *args, **kwargs: _depth_body()
+
+		bare = data.draw(functions(max_argc=0, body=body))
+		applied = data.draw(functions(
+			max_argc=0, body=body, decorators=decorators
+		))
+		fused = data.draw(functions(
+			max_argc=0, body=body, decorators=decorators, fuse_decorators=True
+		))
+
+		# only the innermost fusable run is fused, the rest still wrap
+		assert applied()[1:] == fused()[1:] == (4, 3, 2, 1, 0)
+		assert fused()[0] == bare()[0] + 3
+		assert applied()[0] == bare()[0] + 5
+
+	@given(data(), booleans())
+	def test_method_trampolines_return_value(self, data, fuse):
+		parent = builds(lambda: type("Container", (object,), {}))
+		body = lambda *args, **kwargs: (len(args),)
+		generated = lambda strategy: data.draw(strategy(
+			parent=parent, max_argc=0, body=body,
+			decorators=[_tagging_decorator(1)], fuse_decorators=fuse
+		))
+
+		# methods are looked up on the class, so self has to be passed in
+		assert generated(methods)(None) == (1, 1)
+		assert generated(classmethods)() == (1, 1)
+		assert generated(staticfunctions)() == (0, 1)
+
+class TestModuleStrategy(object):
+	"""Tests for modules(), both in memory and written to disk."""
+
+	@given(modules(members=classes(), max_members=20))
+	@settings(suppress_health_check=[hc.too_slow, hc.data_too_large])
+	def test_members_bound(self, module):
+		assert sys.modules[module.__name__] is module
+
+		for attribute in dir(module):
+			if not attribute.startswith("__"):
+				assert getattr(module, attribute).__module__ == module.__name__
+
+	@given(modules(members=classes(), max_members=5, on_disk=True))
+	@settings(suppress_health_check=[hc.too_slow])
+	def test_on_disk_import(self, module):
+		# builtin and frozen modules would have no __file__, or another one
+		assert path.basename(module.__file__) == module.__name__ + ".py"
+		assert path.isfile(module.__file__)
+
+	@given(modules(max_members=10))
+	def test_default_members(self, module):
+		for attribute in dir(module):
+			if not attribute.startswith("__"):
+				member = getattr(module, attribute)
+				assert callable(member)
+				assert member.__module__ == module.__name__
+
+	@given(modules(max_members=10, on_disk=True))
+	def test_written_bytecode(self, module):
+		cached = importlib.util.cache_from_source(module.__file__)
+		assert module.__spec__.cached == cached
+
+		with open(cached, "rb") as stream:
+			data = stream.read()
+
+		# magic number, then flags, mtime and size ahead of the code object
+		assert data[:4] == importlib.util.MAGIC_NUMBER
+		code = marshal.loads(data[16:])
+
+		for attribute in dir(module):
+			if not attribute.startswith("__"):
+				assert attribute in code.co_names
+
+	@given(modules(
+		members=one_of(classes(children={}), functions()),
+		max_members=50, on_disk=True
+	))
+	@settings(max_examples=5, suppress_health_check=[hc.too_slow])
+	def test_standalone_import(self, module):
+		# plain members are written out as source, nothing is bound from here
+		subprocess.check_call(
+			[sys.executable, "-c", "import " + module.__name__],
+			cwd=path.dirname(module.__file__)
+		)
+
+	@given(data())
+	@settings(max_examples=20, suppress_health_check=[hc.too_slow])
+	def test_bulk_members(self, data):
+		module = data.draw(modules(
+			min_members=300, on_disk=data.draw(booleans())
+		))
+
+		members = [
+			attribute for attribute in vars(module)
+				if not attribute.startswith("__")
+		]
+		assert 300 <= len(members) <= 400
+
+	@given(modules(min_members=300, max_members=300, on_disk=True))
+	@settings(max_examples=3, suppress_health_check=[hc.too_slow])
+	def test_bulk_standalone_import(self, module):
+		subprocess.check_call(
+			[sys.executable, "-c", "import " + module.__name__],
+			cwd=path.dirname(module.__file__)
+		)
+
+	@given(data())
+	def test_bad_member_names(self, data):
+		for member in (1, lambda: None, type("if", (object,), {})):
+			with pytest.raises(he.InvalidArgument):
+				data.draw(modules(members=just(member), min_members=1))
+
+	def test_importable_names_are_taken(self):
+		# builtin and frozen modules are found ahead of any generated file
+		for name in sys.builtin_module_names + ("runpy", "ntpath"):
+			assert not _is_free_module_name(name)
+
+	def test_teardown(self):
+		installed = []
+
+		@given(modules(members=classes(), max_members=5, on_disk=True))
+		@settings(max_examples=5, suppress_health_check=[hc.too_slow])
+		def generate(module):
+			installed.append((module.__name__, path.dirname(module.__file__)))
+
+			# re-import by name, the way an import would be timed
+			del sys.modules[module.__name__]
+			assert importlib.import_module(module.__name__) is not module
+
+		generate()
+
+		assert installed
+		for name, directory in installed:
+			assert name not in sys.modules
+			assert directory not in sys.path
+			assert directory not in sys.path_importer_cache
+			assert not path.exists(directory)
 
 class TestParameterStrategy(object):
 	pass